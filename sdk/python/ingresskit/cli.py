@@ -1,6 +1,6 @@
 import typer
 from pathlib import Path
-from .repair import Repairer, Schema
+from .repair import DEFAULT_CHUNK_SIZE, Repairer, Schema
 
 app = typer.Typer(add_completion=False)
 
@@ -11,6 +11,10 @@ def main(
     out: Path = typer.Option(..., "--out", help="Output cleaned CSV file"),
     schema: str = typer.Option("contacts", help="Target schema: contacts|transactions|products"),
     tenant_id: str = typer.Option("default", help="Tenant identifier for episodic memory (placeholder)"),
+    chunk_size: int = typer.Option(
+        DEFAULT_CHUNK_SIZE, help="Approximate bytes of input processed per batch"
+    ),
+    workers: int = typer.Option(1, help="Threads used to coerce columns in parallel"),
 ):
     schemas = {
         "contacts": Schema.contacts(),
@@ -21,9 +25,13 @@ def main(
         typer.echo(f"Unknown schema: {schema}")
         raise typer.Exit(code=1)
 
-    r = Repairer(schema=schemas[schema], tenant_id=tenant_id)
-    result = r.repair_file(in_)
-    result.save(out)
+    r = Repairer(
+        schema=schemas[schema],
+        tenant_id=tenant_id,
+        chunk_size=chunk_size,
+        workers=workers,
+    )
+    result = r.repair_file(in_, out)
     typer.echo(f"Repaired {result.summary['rows_in']} rows -> {result.summary['rows_out']} rows")
     typer.echo(f"Sample diffs: {result.sample_diffs}")
 
@@ -1,22 +1,64 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Tuple, Iterator, Sequence, Callable
+from concurrent.futures import ThreadPoolExecutor
+import contextlib
 import csv
-import json
+import functools
 from pathlib import Path
-from collections import OrderedDict
 from dateutil import parser as date_parser
-from .units import normalize_mass, normalize_length
+from .units import LENGTH_UNITS, MASS_UNITS
 import re
+import sys
 import datetime as dt
 
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    from pyarrow import csv as pa_csv
+except ImportError:  # optional: without pyarrow we parse with the csv module
+    pa = None
+
+try:
+    import ciso8601
+except ImportError:  # optional: ISO dates then go through strptime
+    ciso8601 = None
+
+
+# Bytes of input parsed per batch (Repairer's chunk_size). 256 KiB batches stay
+# cache-resident while coercing yet are large enough to amortize per-batch work.
+DEFAULT_CHUNK_SIZE = 256 << 10
+# The csv reader turns chunk_size into a row count with this.
+_ROW_BYTES_ESTIMATE = 64
+
+_SLUG_NONALNUM = re.compile(r"[^a-z0-9]+")
+_SLUG_WS = re.compile(r"\s+")
+_NON_DIGIT = re.compile(r"\D")
+_AMOUNT_STRIP = re.compile(r"[^0-9.\-]")
+_CURRENCY_STRIP = re.compile(r"[^A-Za-z]")
+# Amounts already in "%.2f" form with <= 15 significant digits round-trip
+# through float unchanged, so they can be passed through as-is. ASCII digits
+# only: in a str pattern \d also matches Unicode digits, which _AMOUNT_STRIP drops.
+_CANONICAL_AMOUNT = re.compile(r"-?(?:0|[1-9][0-9]{0,12})\.[0-9][0-9]")
+_HEADER_UNIT = re.compile(r"^(.+?)\s*\(([^)]+)\)\s*$")
+# Every byte except ASCII 0-9: bytes.translate(None, _NON_DIGIT_BYTES) keeps digits
+_NON_DIGIT_BYTES = bytes(b for b in range(256) if not 0x30 <= b <= 0x39)
+
 
 CANONICAL_SCHEMAS: Dict[str, List[str]] = {
     "contacts": ["email", "phone", "first_name", "last_name", "company"],
     "transactions": ["id", "amount", "currency", "occurred_at", "customer_id"],
     # Extended with canonical unit fields for demonstration
-    "products": ["sku", "name", "price", "currency", "category", "weight_kg", "length_m"],
+    "products": [
+        "sku",
+        "name",
+        "price",
+        "currency",
+        "category",
+        "weight_kg",
+        "length_m",
+    ],
 }
 
 
@@ -42,100 +84,476 @@ HEADER_SYNONYMS: Dict[str, List[str]] = {
 }
 
 
+# Header strings recur heavily across files in batch runs; slugs and guesses
+# are pure functions of their arguments, so both are memoized
+@functools.lru_cache(maxsize=4096)
 def _slugify(s: str) -> str:
     s = s.strip().lower()
-    s = re.sub(r"[^a-z0-9]+", " ", s).strip()
-    s = re.sub(r"\s+", "_", s)
+    s = _SLUG_NONALNUM.sub(" ", s).strip()
+    s = _SLUG_WS.sub("_", s)
     return s
 
 
-def _guess_header(name: str, schema: List[str]) -> Optional[str]:
+# Reverse index of HEADER_SYNONYMS: slug -> canonical fields, in declaration
+# order. A slug can belong to several canonicals (e.g. "price" is both an
+# amount and a product price); the schema decides which one applies.
+def _build_syn_index() -> Dict[str, List[str]]:
+    index: Dict[str, List[str]] = {}
+    for canonical, syns in HEADER_SYNONYMS.items():
+        for syn in syns:
+            cands = index.setdefault(_slugify(syn), [])
+            if canonical not in cands:
+                cands.append(canonical)
+    return index
+
+
+_SYN_INDEX = _build_syn_index()
+
+
+def _lookup_synonym(slug: str, schema: Sequence[str]) -> Optional[str]:
+    for canonical in _SYN_INDEX.get(slug, ()):
+        if canonical in schema:
+            return canonical
+    return None
+
+
+@functools.lru_cache(maxsize=4096)
+def _guess_header(name: str, schema: Tuple[str, ...]) -> Optional[str]:
     slug = _slugify(name)
     # Exact
     if slug in schema:
-        return slug
+        # Interned so it hits the identity fast path as a key in output dicts
+        return sys.intern(slug)
     # Synonyms
-    for canonical, syns in HEADER_SYNONYMS.items():
-        if canonical in schema and slug in {_slugify(x) for x in syns}:
-            return canonical
+    canonical = _lookup_synonym(slug, schema)
+    if canonical is not None:
+        return canonical
     # Handle unit-bearing headers like "Weight (lb)" or "Length (ft)"
-    m = re.match(r"^(.+?)\s*\(([^)]+)\)\s*$", name.strip())
+    m = _HEADER_UNIT.match(name.strip())
     if m:
-        base, unit = m.group(1), m.group(2)
-        base_slug = _slugify(base)
-        # Map base to a canonical unit field if present in schema via synonyms
-        for canonical, syns in HEADER_SYNONYMS.items():
-            if canonical in schema and base_slug in {_slugify(x) for x in syns}:
-                # Return canonical field; unit will be handled during coercion
-                return canonical
+        # Return canonical field; unit will be handled during coercion
+        return _lookup_synonym(_slugify(m.group(1)), schema)
     return None
 
 
-def _coerce_value(field: str, value: str) -> Tuple[Optional[str], Optional[str]]:
+_DATE_FORMATS = (
+    "%Y-%m-%d",
+    "%m/%d/%Y",
+    "%Y/%m/%d",
+    "%d-%b-%Y",
+    "%d/%m/%Y",
+    "%b %d, %Y",
+)
+
+
+def _parse_date(v: str) -> Optional[str]:
+    """Return ``v`` as an ISO date (YYYY-MM-DD), or None if unparseable."""
+    if ciso8601 is not None:
+        try:
+            return ciso8601.parse_datetime(v).date().isoformat()
+        except ValueError:
+            pass
+    # Try common fast paths first
+    for fmt in _DATE_FORMATS:
+        try:
+            return dt.datetime.strptime(v, fmt).date().isoformat()
+        except Exception:
+            pass
+    # Fallback to dateutil parser
+    try:
+        return date_parser.parse(v).date().isoformat()
+    except Exception:
+        return None
+
+
+ScalarCoercer = Callable[[str], Tuple[Optional[str], Optional[str]]]
+
+_COMMON_CURRENCIES = frozenset({"USD", "EUR", "GBP", "JPY", "CAD", "AUD", "INR"})
+
+
+def _coerce_email(v: str) -> Tuple[Optional[str], Optional[str]]:
+    return v.lower(), None
+
+
+def _coerce_phone(v: str) -> Tuple[Optional[str], Optional[str]]:
+    if v.isascii():
+        # A single C pass over the bytes, about twice as fast as the regex
+        return v.encode("ascii").translate(None, _NON_DIGIT_BYTES).decode("ascii"), None
+    # Non-ASCII input may contain Unicode digits, which \D treats as digits
+    return _NON_DIGIT.sub("", v), None
+
+
+def _coerce_amount(v: str) -> Tuple[Optional[str], Optional[str]]:
+    if _CANONICAL_AMOUNT.fullmatch(v):
+        return v, None
+    num = _AMOUNT_STRIP.sub("", v)
+    return f"{float(num):.2f}", None
+
+
+def _coerce_date(v: str) -> Tuple[Optional[str], Optional[str]]:
+    d = _parse_date(v)
+    if d is None:
+        return None, f"unrecognized_date:{v}"
+    return d, None
+
+
+def _coerce_currency(v: str) -> Tuple[Optional[str], Optional[str]]:
+    cur = _CURRENCY_STRIP.sub("", v).upper()
+    if cur in _COMMON_CURRENCIES:
+        return cur, None
+    if 2 <= len(cur) <= 4:
+        return cur, None
+    return None, f"bad_currency:{v}"
+
+
+def _coerce_text(v: str) -> Tuple[Optional[str], Optional[str]]:
+    return v, None
+
+
+# Per-field coercers for a single stripped, non-empty cell; other fields are
+# kept as text.
+_SCALAR_COERCERS: Dict[str, ScalarCoercer] = {
+    "email": _coerce_email,
+    "phone": _coerce_phone,
+    "amount": _coerce_amount,
+    "price": _coerce_amount,
+    "occurred_at": _coerce_date,
+    "currency": _coerce_currency,
+}
+
+
+def _coerce_with(
+    fn: ScalarCoercer, value: Optional[str]
+) -> Tuple[Optional[str], Optional[str]]:
     if value is None:
         return None, None
     v = value.strip()
     if v == "":
         return None, None
     try:
-        if field in {"email"}:
-            return v.lower(), None
-        if field in {"phone"}:
-            digits = re.sub(r"\D", "", v)
-            return digits, None
-        if field in {"amount", "price"}:
-            num = re.sub(r"[^0-9.\-]", "", v)
-            return f"{float(num):.2f}", None
-        if field in {"occurred_at"}:
-            # Try common fast paths first
-            for fmt in ("%Y-%m-%d", "%m/%d/%Y", "%Y/%m/%d", "%d-%b-%Y", "%d/%m/%Y", "%b %d, %Y"):
-                try:
-                    return dt.datetime.strptime(v, fmt).date().isoformat(), None
-                except Exception:
-                    pass
-            # Fallback to dateutil parser
-            try:
-                return date_parser.parse(v).date().isoformat(), None
-            except Exception:
-                return None, f"unrecognized_date:{v}"
-        if field in {"currency"}:
-            cur = re.sub(r"[^A-Za-z]", "", v).upper()
-            COMMON = {"USD", "EUR", "GBP", "JPY", "CAD", "AUD", "INR"}
-            if cur in COMMON:
-                return cur, None
-            if 2 <= len(cur) <= 4:
-                return cur, None
-            return None, f"bad_currency:{v}"
-        if field in {"id", "customer_id", "sku"}:
-            return v, None
-        if field in {"name", "category"}:
-            return v.strip(), None
-        return v, None
+        return fn(v)
     except Exception as e:
         return None, f"coerce_error:{type(e).__name__}"
 
 
+def _coerce_value(field: str, value: str) -> Tuple[Optional[str], Optional[str]]:
+    return _coerce_with(_SCALAR_COERCERS.get(field, _coerce_text), value)
+
+
 def _extract_header_unit(header: str) -> Optional[str]:
-    m = re.match(r"^(.+?)\s*\(([^)]+)\)\s*$", header.strip())
+    m = _HEADER_UNIT.match(header.strip())
     if m:
         return m.group(2).strip()
     return None
 
 
+def _read_header(path: Path) -> Tuple[Optional[List[str]], int]:
+    """Return the header record and the number of physical lines it spans."""
+    with path.open("r", encoding="utf-8", errors="ignore", newline="") as f:
+        reader = csv.reader(f)
+        return next(reader, None), reader.line_num
+
+
+def _iter_csv_batches(
+    path: Path, width: int, chunk_size: int, skip: int = 0
+) -> Iterator[List[Sequence[Optional[str]]]]:
+    """Yield column-major batches parsed by the csv module.
+
+    Rows are padded/truncated to ``width`` so every column has the same length;
+    blank lines are skipped. ``skip`` drops that many data rows first.
+    """
+    batch_rows = max(1, chunk_size // _ROW_BYTES_ESTIMATE)
+    with path.open("r", encoding="utf-8", errors="ignore", newline="") as f:
+        reader = csv.reader(f)
+        next(reader, None)
+        pad = [None] * width
+        rows: List[List[Optional[str]]] = []
+        for r in reader:
+            if not r:
+                continue
+            if skip:
+                skip -= 1
+                continue
+            rows.append((r + pad)[:width])
+            if len(rows) >= batch_rows:
+                yield list(zip(*rows))
+                rows = []
+        if rows:
+            yield list(zip(*rows))
+
+
+def _iter_arrow_batches(
+    path: Path, width: int, chunk_size: int, header_lines: int = 1
+) -> Iterator[List[Any]]:
+    names = [f"f{i}" for i in range(width)]
+    # skip_rows counts physical lines, so a header with a quoted newline
+    # needs every line it spans skipped
+    reader = pa_csv.open_csv(
+        path,
+        read_options=pa_csv.ReadOptions(
+            block_size=chunk_size, skip_rows=header_lines, column_names=names
+        ),
+        parse_options=pa_csv.ParseOptions(newlines_in_values=True),
+        convert_options=pa_csv.ConvertOptions(
+            column_types={n: pa.string() for n in names}
+        ),
+    )
+    for batch in reader:
+        yield batch.columns
+
+
+if pa is not None:
+    _fast_batches, _FAST_READ_ERRORS = _iter_arrow_batches, (pa.ArrowInvalid,)
+else:
+    _fast_batches, _FAST_READ_ERRORS = None, ()
+
+
+def _iter_column_batches(
+    path: Path, width: int, chunk_size: int = DEFAULT_CHUNK_SIZE, header_lines: int = 1
+) -> Iterator[List[Any]]:
+    """Yield the data rows of ``path`` as batches of columns.
+
+    Each batch covers roughly ``chunk_size`` bytes of input, so memory use
+    is bounded regardless of file size. ``header_lines`` is the number of
+    physical lines taken by the header record (more than one if a header
+    cell contains a quoted newline).
+
+    The file is parsed by pyarrow when it is installed (batches of
+    ``pyarrow.StringArray``). Otherwise, or if Arrow rejects the input
+    part-way (ragged rows, invalid UTF-8), the remaining rows are read with
+    the csv module.
+    """
+    done = 0
+    if _fast_batches is not None and width:
+        try:
+            for columns in _fast_batches(path, width, chunk_size, header_lines):
+                yield columns
+                done += len(columns[0])
+            return
+        except _FAST_READ_ERRORS:
+            pass
+    yield from _iter_csv_batches(path, width, chunk_size, skip=done)
+
+
+def _arrow_blank_to_null(trimmed: "pa.Array", values: "pa.Array") -> "pa.Array":
+    return pc.if_else(pc.equal(trimmed, ""), pa.scalar(None, pa.string()), values)
+
+
+def _arrow_email(arr: "pa.Array") -> "pa.Array":
+    trimmed = pc.utf8_trim_whitespace(arr)
+    if pc.all(pc.string_is_ascii(trimmed)).as_py() is False:
+        # utf8_lower and str.lower disagree on a few letters ("İ", final "Σ"),
+        # so batches with non-ASCII cells are lowered by Python
+        lowered = pa.array(
+            [None if v is None else v.lower() for v in trimmed.to_pylist()], pa.string()
+        )
+    else:
+        lowered = pc.ascii_lower(trimmed)
+    return _arrow_blank_to_null(trimmed, lowered)
+
+
+def _arrow_phone(arr: "pa.Array") -> "pa.Array":
+    trimmed = pc.utf8_trim_whitespace(arr)
+    # RE2's \D is ASCII-only; \P{Nd} keeps Unicode digits like Python's \D does
+    digits = pc.replace_substring_regex(trimmed, pattern=r"\P{Nd}", replacement="")
+    return _arrow_blank_to_null(trimmed, digits)
+
+
+def _arrow_numeric_text(trimmed: "pa.Array") -> "pa.Array":
+    num = pc.replace_substring_regex(
+        trimmed, pattern=_AMOUNT_STRIP.pattern, replacement=""
+    )
+    # Only strings float() would accept survive; the rest become null
+    return pc.if_else(
+        pc.match_substring_regex(num, r"^-?(\d+\.?\d*|\.\d+)$"),
+        num,
+        pa.scalar(None, pa.string()),
+    )
+
+
+def _arrow_fixed(num: "pa.Array", text: "pa.Array", scale: int) -> "pa.Array":
+    """Format ``num`` like f"{x:.{scale}f}"; ``text`` is its numeric source text.
+
+    The decimal cast rounds like the format spec and raises on overflow, but
+    has no negative zero: "-0.001" would print "0.00" where Python prints
+    "-0.00", so those cells are patched from the sign of the source text.
+    """
+    dec = pc.cast(num, pa.decimal128(38, scale))
+    neg_zero = pc.and_(pc.starts_with(text, "-"), pc.equal(dec, pa.scalar(0, dec.type)))
+    return pc.if_else(neg_zero, "-0." + "0" * scale, pc.cast(dec, pa.string()))
+
+
+def _arrow_amount(arr: "pa.Array") -> "pa.Array":
+    trimmed = pc.utf8_trim_whitespace(arr)
+    text = _arrow_numeric_text(trimmed)
+    amounts = _arrow_fixed(pc.cast(text, pa.float64()), text, 2)
+    return _arrow_blank_to_null(trimmed, amounts)
+
+
+def _arrow_unit(arr: "pa.Array", factor: Optional[float]) -> "pa.Array":
+    trimmed = pc.utf8_trim_whitespace(arr)
+    text = _arrow_numeric_text(trimmed)
+    num = pc.cast(text, pa.float64())
+    if factor is None:
+        converted = pa.nulls(len(arr), pa.string())
+    else:
+        converted = _arrow_fixed(pc.multiply(num, factor), text, 6)
+    # Cells that are not numbers are passed through like other text fields
+    return pc.if_else(pc.is_valid(num), converted, _arrow_strip(arr))
+
+
+def _arrow_currency(arr: "pa.Array") -> "pa.Array":
+    trimmed = pc.utf8_trim_whitespace(arr)
+    letters = pc.replace_substring_regex(
+        trimmed, pattern=_CURRENCY_STRIP.pattern, replacement=""
+    )
+    cur = pc.utf8_upper(letters)
+    n = pc.utf8_length(cur)
+    ok = pc.and_(pc.greater_equal(n, 2), pc.less_equal(n, 4))
+    return pc.if_else(ok, cur, pa.scalar(None, pa.string()))
+
+
+def _arrow_date(arr: "pa.Array") -> "pa.Array":
+    trimmed = pc.utf8_trim_whitespace(arr)
+    # Dates repeat heavily in transaction files: parse each distinct value once
+    encoded = pc.dictionary_encode(trimmed)
+    uniq = encoded.dictionary
+    # ISO dates are already canonical. Arrow's strptime rolls invalid days
+    # over (2025-02-30 -> 2025-03-02), so keep only exact round-trips.
+    ts = pc.strptime(uniq, format="%Y-%m-%d", unit="s", error_is_null=True)
+    iso = pc.cast(pc.cast(ts, pa.date32()), pa.string())
+    iso = pc.if_else(pc.equal(iso, uniq), iso, pa.scalar(None, pa.string()))
+    rest = [
+        None if ok or not v else _parse_date(v)
+        for v, ok in zip(uniq.to_pylist(), pc.is_valid(iso).to_pylist())
+    ]
+    dates = pc.coalesce(iso, pa.array(rest, pa.string()))
+    return pc.take(dates, encoded.indices)
+
+
+def _arrow_strip(arr: "pa.Array") -> "pa.Array":
+    trimmed = pc.utf8_trim_whitespace(arr)
+    return _arrow_blank_to_null(trimmed, trimmed)
+
+
+# Column kernels: whole-column equivalents of _coerce_value for Arrow arrays.
+_ARROW_KERNELS = {
+    "email": _arrow_email,
+    "phone": _arrow_phone,
+    "amount": _arrow_amount,
+    "price": _arrow_amount,
+    "currency": _arrow_currency,
+    "occurred_at": _arrow_date,
+    "id": _arrow_strip,
+    "customer_id": _arrow_strip,
+    "sku": _arrow_strip,
+    "name": _arrow_strip,
+    "category": _arrow_strip,
+    "first_name": _arrow_strip,
+    "last_name": _arrow_strip,
+    "company": _arrow_strip,
+    "weight_kg": _arrow_strip,
+    "length_m": _arrow_strip,
+}
+
+
+# Canonical unit fields and the table of factors converting into them.
+_UNIT_TABLES = {"weight_kg": MASS_UNITS, "length_m": LENGTH_UNITS}
+
+
+def _convert_unit(
+    raw: Optional[str], coerced: Optional[str], factor: Optional[float]
+) -> Optional[str]:
+    try:
+        num = float(_AMOUNT_STRIP.sub("", raw))
+    except Exception:
+        return coerced
+    return None if factor is None else f"{num * factor:.6f}"
+
+
+ColumnCoercer = Callable[[Any], List[Optional[str]]]
+
+# Low-cardinality fields whose scalar coercion is expensive: on the per-cell
+# path each distinct value in a batch is coerced once and the result reused.
+_MEMO_FIELDS = frozenset({"occurred_at", "currency"})
+
+
+def _column_coercer(field: str, unit: Optional[str] = None) -> ColumnCoercer:
+    """Build the function that coerces one input column mapped to ``field``.
+
+    Everything that depends only on the header (Arrow kernel, scalar
+    coercer, unit factor) is resolved here, once per file, so coercing a
+    batch is a single call with no per-cell dispatch.
+
+    ``unit`` is the unit from a header like "Weight (lb)"; for canonical unit
+    fields the column is converted with a single factor looked up up front.
+    """
+    scalar = _SCALAR_COERCERS.get(field, _coerce_text)
+    memo = field in _MEMO_FIELDS
+    factor = None
+    if unit and field in _UNIT_TABLES:
+        factor = _UNIT_TABLES[field].get(unit.strip().lower())
+    else:
+        unit = None
+    kernel = None
+    if pa is not None:
+        if unit:
+            kernel = functools.partial(_arrow_unit, factor=factor)
+        else:
+            kernel = _ARROW_KERNELS.get(field)
+
+    def coerce(values: Any) -> List[Optional[str]]:
+        if pa is not None and isinstance(values, pa.Array):
+            if kernel is not None:
+                try:
+                    return kernel(values).to_pylist()
+                except pa.ArrowInvalid:
+                    pass  # e.g. an amount too large for decimal128; redo per cell
+            values = values.to_pylist()
+        if memo:
+            seen = {v: _coerce_with(scalar, v)[0] for v in dict.fromkeys(values)}
+            out = [seen[v] for v in values]
+        else:
+            out = [_coerce_with(scalar, v)[0] for v in values]
+        # Unit-aware handling for products: if header had units, convert to canonical
+        if unit:
+            out = [
+                c if v is None else _convert_unit(v, c, factor)
+                for v, c in zip(values, out)
+            ]
+        return out
+
+    return coerce
+
+
 @dataclass
 class RepairResult:
-    rows_out: List[Dict[str, Optional[str]]]
+    # None when the output was streamed to disk by repair_file(out_path=...)
+    columns: Optional[Dict[str, List[Optional[str]]]]
     summary: Dict[str, Any]
     sample_diffs: List[Dict[str, Any]]
 
+    def _require_columns(self) -> Dict[str, List[Optional[str]]]:
+        if self.columns is None:
+            raise ValueError("output was streamed to out_path; read it from there")
+        return self.columns
+
+    @functools.cached_property
+    def rows_out(self) -> List[Dict[str, Optional[str]]]:
+        """Row-oriented view of ``columns``, built on first access."""
+        columns = self._require_columns()
+        names = list(columns)
+        return [dict(zip(names, row)) for row in zip(*columns.values())]
+
     def save(self, path: str | Path) -> None:
+        columns = self._require_columns()
         path = Path(path)
         fieldnames = self.summary.get("schema", [])
         with path.open("w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            for r in self.rows_out:
-                writer.writerow({k: ("" if v is None else v) for k, v in r.items()})
+            writer = csv.writer(f)
+            writer.writerow(fieldnames)
+            # csv.writer already writes None as an empty field
+            writer.writerows(zip(*(columns[k] for k in fieldnames)))
 
 
 class Schema:
@@ -153,70 +571,113 @@ class Schema:
 
 
 class Repairer:
-    def __init__(self, schema: List[str], tenant_id: Optional[str] = None):
-        self.schema = schema
+    def __init__(
+        self,
+        schema: List[str],
+        tenant_id: Optional[str] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        workers: int = 1,
+    ):
+        # Field names from custom schemas may be built at runtime; intern them
+        # like the literal canonical names so dict lookups compare by identity
+        self.schema = [sys.intern(k) for k in schema]
         self.tenant_id = tenant_id or "default"
+        # Approximate bytes of input read and coerced per batch
+        self.chunk_size = chunk_size
+        # Threads coercing the columns of a batch concurrently. Arrow kernels
+        # release the GIL, so this only pays off with pyarrow on several cores
+        self.workers = workers
 
-    def repair_file(self, path: str | Path) -> RepairResult:
-        path = Path(path)
-        with path.open("r", encoding="utf-8", errors="ignore") as f:
-            reader = csv.reader(f)
-            rows = list(reader)
+    def repair_file(
+        self, path: str | Path, out_path: str | Path | None = None
+    ) -> RepairResult:
+        """Repair the CSV at ``path``.
 
-        if not rows:
-            return RepairResult([], {"schema": self.schema, "rows_in": 0, "rows_out": 0}, [])
+        If ``out_path`` is given, each repaired batch is written there as soon
+        as it is coerced and only the summary and sample diffs are kept, so
+        memory stays bounded by the batch size. Otherwise the output is
+        collected in ``RepairResult.columns``.
+        """
+        path = Path(path)
+        raw_headers, header_lines = _read_header(path)
+        raw_headers = raw_headers or []
 
-        raw_headers = rows[0]
-        mapped = []
-        header_map: Dict[int, Optional[str]] = {}
+        schema_key = tuple(self.schema)
+        header_map: List[Optional[str]] = [None] * len(raw_headers)
         for i, h in enumerate(raw_headers):
-            header_map[i] = _guess_header(h, self.schema)
+            header_map[i] = _guess_header(h, schema_key)
+        # Specialize once per file: (column index, canonical field, coercer)
+        pipeline: List[Tuple[int, str, ColumnCoercer]] = []
+        for i, target in enumerate(header_map):
+            if target is None:
+                continue
+            unit = None
+            if target in _UNIT_TABLES:
+                unit = _extract_header_unit(raw_headers[i] or "")
+            pipeline.append((i, target, _column_coercer(target, unit)))
 
-        # Build output rows
-        out_rows: List[Dict[str, Optional[str]]] = []
+        # Build output columns, one batch at a time
+        out_cols: Optional[Dict[str, List[Optional[str]]]] = None
+        if out_path is None:
+            out_cols = {k: [] for k in self.schema}
         sample_diffs: List[Dict[str, Any]] = []
+        rows_in = 0
+
+        with contextlib.ExitStack() as stack:
+            writer = None
+            if out_path is not None:
+                out = Path(out_path).open("w", newline="", encoding="utf-8")
+                writer = csv.writer(stack.enter_context(out))
+                writer.writerow(self.schema)
+            pool = None
+            if self.workers > 1 and len(pipeline) > 1:
+                workers = min(self.workers, len(pipeline))
+                pool = stack.enter_context(ThreadPoolExecutor(max_workers=workers))
 
-        for r in rows[1:]:
-            out: Dict[str, Optional[str]] = {k: None for k in self.schema}
-            before: Dict[str, Any] = {}
-            after: Dict[str, Any] = {}
-            for i, val in enumerate(r):
-                target = header_map.get(i)
-                if target is None:
-                    continue
-                before[target] = val
-                coerced, err = _coerce_value(target, val)
-                out[target] = coerced
-                after[target] = coerced
-                # errors could be collected if desired
-                # Unit-aware handling for products: if header had units, convert to canonical
-                if target in {"weight_kg", "length_m"}:
-                    unit = _extract_header_unit(raw_headers[i] or "")
-                    if unit:
-                        try:
-                            num = float(re.sub(r"[^0-9.\-]", "", val))
-                        except Exception:
-                            num = None
-                        if num is not None:
-                            if target == "weight_kg":
-                                kg, _ = normalize_mass(num, unit)
-                                out[target] = None if kg is None else f"{kg:.6f}"
-                                after[target] = out[target]
-                            elif target == "length_m":
-                                m, _ = normalize_length(num, unit)
-                                out[target] = None if m is None else f"{m:.6f}"
-                                after[target] = out[target]
-            out_rows.append(out)
-            if len(sample_diffs) < 5:
-                sample_diffs.append({"before": before, "after": after})
+            batches = ()
+            if raw_headers:
+                batches = _iter_column_batches(
+                    path, len(raw_headers), self.chunk_size, header_lines
+                )
+            for columns in batches:
+                n = len(columns[0])
+                rows_in += n
+                if pool is not None:
+                    results = pool.map(lambda step: step[2](columns[step[0]]), pipeline)
+                    coerced = [(t, out) for (_, t, _), out in zip(pipeline, results)]
+                else:
+                    coerced = [(target, fn(columns[i])) for i, target, fn in pipeline]
+                # When several input columns map to one field the last one wins
+                batch = dict(coerced)
+                fields = [batch.get(k) or [None] * n for k in self.schema]
+                if writer is not None:
+                    # csv.writer already writes None as an empty field
+                    writer.writerows(zip(*fields))
+                else:
+                    for col, values in zip(out_cols.values(), fields):
+                        col.extend(values)
+
+                # Sample diffs show the raw and coerced value of each mapped cell
+                if len(sample_diffs) < 5:
+                    raw = [(target, columns[i]) for i, target, _ in pipeline]
+                    for r in range(min(n, 5 - len(sample_diffs))):
+                        before: Dict[str, Any] = {}
+                        after: Dict[str, Any] = {}
+                        for (target, col), (_, values) in zip(raw, coerced):
+                            val = col[r]
+                            if pa is not None and isinstance(val, pa.Scalar):
+                                val = val.as_py()
+                            if val is None:
+                                continue
+                            before[target] = val
+                            after[target] = values[r]
+                        sample_diffs.append({"before": before, "after": after})
 
         summary = {
             "schema": self.schema,
-            "rows_in": max(0, len(rows) - 1),
-            "rows_out": len(out_rows),
+            "rows_in": rows_in,
+            "rows_out": rows_in,
             "mapped_headers": {i: header_map[i] for i in range(len(raw_headers))},
         }
 
-        return RepairResult(out_rows, summary, sample_diffs)
-
-
+        return RepairResult(out_cols, summary, sample_diffs)
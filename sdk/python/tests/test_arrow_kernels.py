@@ -0,0 +1,85 @@
+import pytest
+
+from ingresskit import repair
+
+pa = pytest.importorskip("pyarrow")
+
+
+def scalar_path(field, cells):
+    return [repair._coerce_value(field, v)[0] for v in cells]
+
+
+def arrow_path(field, cells):
+    return repair._ARROW_KERNELS[field](pa.array(cells, pa.string())).to_pylist()
+
+
+PHONE_CELLS = [
+    "(555) 123-4567",
+    " +1 555.123.4567 ",
+    "٣٣٣-12",
+    "１２３",
+    "+1 ５５５",
+    "no digits",
+    "",
+    "   ",
+    None,
+]
+
+EMAIL_CELLS = [
+    "USER@EXAMPLE.COM",
+    "  Mixed@Case.Org ",
+    "İX@EXAMPLE.COM",
+    "ΟΔΥΣΣΕΥΣ@EXAMPLE.COM",
+    "",
+    None,
+]
+
+
+def test_phone_kernel_matches_scalar_path():
+    assert arrow_path("phone", PHONE_CELLS) == scalar_path("phone", PHONE_CELLS)
+
+
+def test_email_kernel_matches_scalar_path():
+    assert arrow_path("email", EMAIL_CELLS) == scalar_path("email", EMAIL_CELLS)
+
+
+def test_email_kernel_ascii_batch():
+    cells = ["A@B.COM", "  c@D.io ", ""]
+    assert arrow_path("email", cells) == ["a@b.com", "c@d.io", None]
+
+
+AMOUNT_CELLS = [
+    "12",
+    "$1,234.565",
+    "2.675",
+    "0.125",
+    "-1.005",
+    ".5",
+    "5.",
+    "-0.001",
+    "-0.004",
+    "-0",
+    "-0.00",
+    "1.٣٣",
+    "abc",
+    "",
+    None,
+]
+
+
+def test_amount_kernel_matches_scalar_path():
+    assert arrow_path("amount", AMOUNT_CELLS) == scalar_path("amount", AMOUNT_CELLS)
+
+
+def test_amount_kernel_keeps_negative_zero():
+    assert arrow_path("amount", ["-0.001", "-0.004"]) == ["-0.00", "-0.00"]
+
+
+def test_canonical_amount_fast_path_is_ascii_only():
+    assert scalar_path("amount", ["1.٣٣", "12.50"]) == ["1.00", "12.50"]
+
+
+def test_unit_kernel_matches_scalar_path():
+    cells = ["2.5", "-3", "-0", "-0.0000001", "heavy", "", None]
+    coerce = repair._column_coercer("weight_kg", "lb")
+    assert coerce(pa.array(cells, pa.string())) == coerce(cells)
@@ -0,0 +1,144 @@
+from pathlib import Path
+
+import pytest
+
+from ingresskit import repair
+from ingresskit.repair import CANONICAL_SCHEMAS, Repairer
+
+
+EXAMPLES = Path(__file__).resolve().parents[3] / "examples"
+
+CASES = [
+    ("contacts_messy.csv", "contacts", "contacts_clean.csv"),
+    ("transactions_messy.csv", "transactions", "transactions_clean.csv"),
+    ("products_messy.csv", "products", "products_clean.csv"),
+    ("products_with_units.csv", "products", "products_with_units_clean.csv"),
+]
+
+
+@pytest.fixture(params=["arrow", "csv"])
+def backend(request, monkeypatch):
+    """Force one CSV reader, as if only that backend were installed."""
+    if request.param == "arrow":
+        pa = pytest.importorskip("pyarrow")
+        monkeypatch.setattr(repair, "_fast_batches", repair._iter_arrow_batches)
+        monkeypatch.setattr(repair, "_FAST_READ_ERRORS", (pa.ArrowInvalid,))
+    else:
+        monkeypatch.setattr(repair, "pa", None)
+        monkeypatch.setattr(repair, "_fast_batches", None)
+        monkeypatch.setattr(repair, "_FAST_READ_ERRORS", ())
+    return request.param
+
+
+def write_csv(path: Path, lines) -> Path:
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return path
+
+
+def transactions_lines(n: int):
+    lines = ["Transaction ID,Amount (USD),ISO Currency,Date,Customer"]
+    for i in range(n):
+        lines.append(f"txn_{i},${i}.5,usd,08/{i % 28 + 1:02d}/2025,cus_{i % 7}")
+    return lines
+
+
+@pytest.mark.parametrize("messy,schema,clean", CASES)
+def test_repair_file_streams_examples(backend, tmp_path, messy, schema, clean):
+    out = tmp_path / "out.csv"
+    result = Repairer(CANONICAL_SCHEMAS[schema]).repair_file(EXAMPLES / messy, out)
+    assert out.read_text(encoding="utf-8") == (EXAMPLES / clean).read_text(encoding="utf-8")
+    assert result.columns is None
+    with pytest.raises(ValueError):
+        result.rows_out
+
+
+@pytest.mark.parametrize("messy,schema,clean", CASES)
+def test_repair_file_in_memory_examples(backend, tmp_path, messy, schema, clean):
+    result = Repairer(CANONICAL_SCHEMAS[schema]).repair_file(EXAMPLES / messy)
+    assert list(result.columns) == CANONICAL_SCHEMAS[schema]
+    assert result.summary["rows_in"] == result.summary["rows_out"] == len(result.rows_out)
+    out = tmp_path / "out.csv"
+    result.save(out)
+    assert out.read_text(encoding="utf-8") == (EXAMPLES / clean).read_text(encoding="utf-8")
+
+
+def test_rows_out_is_row_view_of_columns(backend):
+    result = Repairer(CANONICAL_SCHEMAS["contacts"]).repair_file(EXAMPLES / "contacts_messy.csv")
+    assert result.rows_out[0] == {
+        "email": "user@example.com",
+        "phone": "5551234567",
+        "first_name": None,
+        "last_name": None,
+        "company": "Acme Inc",
+    }
+    assert [r["email"] for r in result.rows_out] == result.columns["email"]
+    assert result.rows_out is result.rows_out
+
+
+@pytest.mark.parametrize("extra", [",extra", ""], ids=["long_row", "short_row"])
+def test_ragged_row_after_first_batch(backend, monkeypatch, tmp_path, extra):
+    lines = transactions_lines(200)
+    # Well past the first batch: a C reader gives up here and the csv module
+    # must resume exactly where it stopped
+    lines[150] = lines[150] + extra if extra else "txn_149,$1.00"
+    path = write_csv(tmp_path / "ragged.csv", lines)
+    schema = CANONICAL_SCHEMAS["transactions"]
+
+    result = Repairer(schema, chunk_size=512).repair_file(path)
+
+    monkeypatch.setattr(repair, "_fast_batches", None)
+    expected = Repairer(schema, chunk_size=512).repair_file(path)
+    assert result.summary["rows_in"] == 200
+    assert result.columns == expected.columns
+    assert result.columns["id"] == [f"txn_{i}" for i in range(200)]
+
+
+def test_whitespace_rows_and_late_parse_error(backend, monkeypatch, tmp_path):
+    # Whitespace-only lines are records (one blank cell), not blank lines; the
+    # long row at the end makes Arrow give up only after several batches
+    lines = ["Email"]
+    lines += [" " if i % 10 == 9 else f"U{i}@X.COM" for i in range(2000)]
+    lines.append("late@x.com,extra")
+    path = write_csv(tmp_path / "spaces.csv", lines)
+    schema = CANONICAL_SCHEMAS["contacts"]
+
+    result = Repairer(schema, chunk_size=3200).repair_file(path)
+
+    monkeypatch.setattr(repair, "_fast_batches", None)
+    expected = Repairer(schema, chunk_size=3200).repair_file(path)
+    assert result.summary["rows_in"] == expected.summary["rows_in"] == 2001
+    assert result.columns == expected.columns
+    emails = [e for e in result.columns["email"] if e is not None]
+    assert len(emails) == len(set(emails)) == 1801
+    assert emails[-1] == "late@x.com"
+
+
+def test_multi_line_header(backend, monkeypatch, tmp_path):
+    # The quoted newline makes the header two physical lines; a long row late
+    # in the file forces the csv fallback to resume after Arrow's batches
+    lines = ['"E-\nMail",Company']
+    lines += [f"u{i}@x.com,Acme" for i in range(2000)]
+    lines.append("late@x.com,Acme,extra")
+    path = write_csv(tmp_path / "header.csv", lines)
+    schema = CANONICAL_SCHEMAS["contacts"]
+
+    result = Repairer(schema, chunk_size=3200).repair_file(path)
+
+    assert result.summary["mapped_headers"] == {0: "email", 1: "company"}
+    assert result.columns["email"] == [f"u{i}@x.com" for i in range(2000)] + ["late@x.com"]
+    monkeypatch.setattr(repair, "_fast_batches", None)
+    assert result.columns == Repairer(schema, chunk_size=3200).repair_file(path).columns
+
+
+def test_workers_match_single_thread(backend, tmp_path):
+    path = write_csv(tmp_path / "txns.csv", transactions_lines(500))
+    schema = CANONICAL_SCHEMAS["transactions"]
+    single = Repairer(schema, chunk_size=1024).repair_file(path)
+    threaded = Repairer(schema, chunk_size=1024, workers=4).repair_file(path)
+    assert threaded.columns == single.columns
+    assert threaded.sample_diffs == single.sample_diffs
+
+    out_single, out_threaded = tmp_path / "single.csv", tmp_path / "threaded.csv"
+    Repairer(schema, chunk_size=1024).repair_file(path, out_single)
+    Repairer(schema, chunk_size=1024, workers=4).repair_file(path, out_threaded)
+    assert out_threaded.read_bytes() == out_single.read_bytes()
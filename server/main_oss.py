@@ -1,20 +1,29 @@
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, JSONResponse
 from pathlib import Path
-import json
 import re
+import orjson
 from pydantic import BaseModel
-from typing import Any, Dict
+from typing import Any, Callable, Dict
 from datetime import datetime, timezone
 
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson (C encoder, emits bytes directly)"""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
+
+
 app = FastAPI(
     title="IngressKit - Self-hosted data repair toolkit",
     description="Normalize messy CSVs, webhooks, and JSON data with deterministic, auditable transformations",
     version="0.1.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
 )
 
 # CORS for local development and self-hosted deployments
@@ -168,27 +177,29 @@ def _utc_timestamp(ts: int | float | None) -> str:
         return datetime.now(timezone.utc).isoformat()
 
 
-def normalize_stripe_webhook(payload: Dict[str, Any]) -> CanonicalEvent:
+def normalize_stripe_webhook(payload: Dict[str, Any]) -> Dict[str, Any]:
     """Convert Stripe webhook to canonical event format"""
     obj = payload.get("data", {}).get("object", {})
     trace = [{"op": "stripe_normalize", "timestamp": datetime.now(timezone.utc).isoformat()}]
     
-    return CanonicalEvent(
-        event_id=str(payload.get("id", "")),
-        source="stripe",
-        occurred_at=_utc_timestamp(payload.get("created")),
-        actor={"id": obj.get("customer")} if obj.get("customer") else None,
-        subject={
+    return {
+        "event_id": str(payload.get("id", "")),
+        "source": "stripe",
+        "occurred_at": _utc_timestamp(payload.get("created")),
+        "actor": {"id": obj.get("customer")} if obj.get("customer") else None,
+        "subject": {
             "type": obj.get("object", "unknown"),
             "id": obj.get("id")
         },
-        action=str(payload.get("type", "unknown")),
-        metadata={k: v for k, v in obj.items() if k not in {"id", "object", "customer"}},
-        trace=trace
-    )
+        "action": str(payload.get("type", "unknown")),
+        "metadata": {
+            k: v for k, v in obj.items() if k not in {"id", "object", "customer"}
+        },
+        "trace": trace
+    }
 
 
-def normalize_github_webhook(payload: Dict[str, Any]) -> CanonicalEvent:
+def normalize_github_webhook(payload: Dict[str, Any]) -> Dict[str, Any]:
     """Convert GitHub webhook to canonical event format"""
     action = payload.get("action", "unknown")
     issue = payload.get("issue") or payload.get("pull_request") or {}
@@ -196,47 +207,58 @@ def normalize_github_webhook(payload: Dict[str, Any]) -> CanonicalEvent:
     
     trace = [{"op": "github_normalize", "timestamp": datetime.now(timezone.utc).isoformat()}]
     
-    return CanonicalEvent(
-        event_id=str(payload.get("id", "")),
-        source="github",
-        occurred_at=datetime.now(timezone.utc).isoformat(),
-        actor={
+    return {
+        "event_id": str(payload.get("id", "")),
+        "source": "github",
+        "occurred_at": datetime.now(timezone.utc).isoformat(),
+        "actor": {
             "id": sender.get("id"),
             "login": sender.get("login")
         } if sender else None,
-        subject={
+        "subject": {
             "type": "issue" if "issue" in payload else "pull_request" if "pull_request" in payload else "unknown",
             "id": issue.get("id"),
             "number": issue.get("number")
         },
-        action=action,
-        metadata={
+        "action": str(action),
+        "metadata": {
             "title": issue.get("title"),
             "url": issue.get("html_url"),
             "repository": payload.get("repository", {}).get("full_name")
         },
-        trace=trace
-    )
+        "trace": trace
+    }
 
 
-def normalize_slack_webhook(payload: Dict[str, Any]) -> CanonicalEvent:
+def normalize_slack_webhook(payload: Dict[str, Any]) -> Dict[str, Any]:
     """Convert Slack webhook to canonical event format"""
     event = payload.get("event", {})
     trace = [{"op": "slack_normalize", "timestamp": datetime.now(timezone.utc).isoformat()}]
     
-    return CanonicalEvent(
-        event_id=str(payload.get("event_id", "")),
-        source="slack",
-        occurred_at=_utc_timestamp(payload.get("event_time")),
-        actor={"id": event.get("user")} if event.get("user") else None,
-        subject={
+    return {
+        "event_id": str(payload.get("event_id", "")),
+        "source": "slack",
+        "occurred_at": _utc_timestamp(payload.get("event_time")),
+        "actor": {"id": event.get("user")} if event.get("user") else None,
+        "subject": {
             "type": event.get("type", "message"),
             "channel": event.get("channel")
         },
-        action=event.get("type", "message"),
-        metadata={k: v for k, v in event.items() if k not in {"user", "channel", "type"}},
-        trace=trace
-    )
+        "action": str(event.get("type", "message")),
+        "metadata": {
+            k: v for k, v in event.items() if k not in {"user", "channel", "type"}
+        },
+        "trace": trace
+    }
+
+
+# Normalizers build plain dicts shaped like CanonicalEvent; the model only
+# documents the response schema, so each event is serialized exactly once
+WEBHOOK_NORMALIZERS: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+    "stripe": normalize_stripe_webhook,
+    "github": normalize_github_webhook,
+    "slack": normalize_slack_webhook,
+}
 
 
 @app.post("/v1/webhooks/normalize", response_model=CanonicalEvent)
@@ -250,22 +272,17 @@ async def normalize_webhook(request: Request, source: str):
     - slack: Slack workspace webhooks
     """
     try:
-        payload = await request.json()
+        payload = orjson.loads(await request.body())
     except Exception:
         raise HTTPException(status_code=400, detail="Invalid JSON payload")
 
-    # Route to appropriate normalizer
-    if source == "stripe":
-        return normalize_stripe_webhook(payload)
-    elif source == "github":
-        return normalize_github_webhook(payload)
-    elif source == "slack":
-        return normalize_slack_webhook(payload)
-    else:
+    normalizer = WEBHOOK_NORMALIZERS.get(source)
+    if normalizer is None:
         raise HTTPException(
             status_code=400, 
             detail=f"Unsupported webhook source: {source}. Supported: stripe, github, slack"
         )
+    return ORJSONResponse(content=normalizer(payload))
 
 
 def normalize_contact_json(data: Dict[str, Any]) -> Dict[str, Any]:
@@ -345,12 +362,12 @@ async def normalize_json(request: Request, schema: str):
     - contacts: Normalize contact/customer data
     """
     try:
-        data = await request.json()
+        data = orjson.loads(await request.body())
     except Exception:
         raise HTTPException(status_code=400, detail="Invalid JSON payload")
 
     if schema == "contacts":
-        return normalize_contact_json(data)
+        return ORJSONResponse(content=normalize_contact_json(data))
     else:
         raise HTTPException(
             status_code=400, 
@@ -386,4 +403,5 @@ async def list_schemas():
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8080)
+    # uvloop event loop + httptools parser, both installed by uvicorn[standard]
+    uvicorn.run(app, host="0.0.0.0", port=8080, loop="uvloop", http="httptools")
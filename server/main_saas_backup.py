@@ -1,17 +1,37 @@
 from fastapi import FastAPI, Request, HTTPException, Header, Depends
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, Response
 from pathlib import Path
+from collections import OrderedDict
+from types import MappingProxyType
+import asyncio
+import functools
+import hashlib
+import logging
 import os
+import re
+import sqlite3
+import threading
+import time
 from dotenv import load_dotenv
-import json
+import orjson
+import requests
 import stripe
-from pydantic import BaseModel
-from typing import Any, Dict
+from pydantic import BaseModel, ValidationError
+from typing import Any, Callable, Dict, Iterator, TypeVar
 from datetime import datetime, timezone
 
-app = FastAPI(title="IngressKit Server", version="0.1.0")
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson (C encoder, emits bytes directly)"""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
+
+
+app = FastAPI(title="IngressKit Server", version="0.1.0", default_response_class=ORJSONResponse)
 
 # CORS for docs or demo origins (adjust as needed)
 app.add_middleware(
@@ -34,19 +54,47 @@ static_dir = base_dir / "static"
 app.mount("/static", StaticFiles(directory=str(static_dir), html=False), name="static")
 
 
+index_file = static_dir / "index.html"
+_INDEX_FALLBACK = b"<h1>IngressKit</h1><p>Lightweight data ingress toolkit.</p>"
+_NO_STORE_HEADERS = {"Cache-Control": "no-store"}
+
+
+def _load_index() -> tuple[bytes, float | None]:
+    try:
+        return index_file.read_bytes(), index_file.stat().st_mtime
+    except FileNotFoundError:
+        return _INDEX_FALLBACK, None
+
+
+# Read once at startup; re-read on change only in debug mode (see RELOAD_INDEX)
+_index_html, _index_mtime = _load_index()
+
+
 @app.get("/", response_class=HTMLResponse)
 async def splash() -> HTMLResponse:
-    index = static_dir / "index.html"
-    if index.exists():
-        return HTMLResponse(index.read_text(encoding="utf-8"), headers={"Cache-Control": "no-store"})
-    return HTMLResponse("<h1>IngressKit</h1><p>Lightweight data ingress toolkit.</p>", headers={"Cache-Control": "no-store"})
+    global _index_html, _index_mtime
+    if RELOAD_INDEX:
+        try:
+            mtime = index_file.stat().st_mtime
+        except FileNotFoundError:
+            mtime = None
+        if mtime != _index_mtime:
+            _index_html, _index_mtime = _load_index()
+    return HTMLResponse(_index_html, headers=_NO_STORE_HEADERS)
+
+
+# Constant bodies serialized once. A fresh Response is still built per request:
+# CORSMiddleware edits the header list of the response being sent, so a shared
+# instance would accumulate headers across requests.
+_PONG = b'{"message":"pong"}'
+_RECEIVED = b'{"received":true}'
 
 
 # Simple health check
 @app.get("/v1/ping")
 @app.get("/ping")
-async def ping() -> dict[str, str]:
-    return {"message": "pong"}
+async def ping() -> Response:
+    return Response(_PONG, media_type="application/json")
 
 
 # --- Simple API key + credit meter (starter) ---
@@ -54,105 +102,213 @@ async def ping() -> dict[str, str]:
 load_dotenv(base_dir / ".env", override=True)
 load_dotenv(base_dir.parent / ".env", override=True)
 
-# --- Simple persistent keystore (JSON) ---
+# Development: pick up edits to static/index.html without a restart
+RELOAD_INDEX = bool(os.getenv("INGRESSKIT_DEBUG"))
+
+logger = logging.getLogger(__name__)
+
+
+def _parse_kv_csv(s: str, val: Callable[[str], Any] = int) -> Iterator[tuple[str, Any]]:
+    """Yield (key, val(value)) from "k1:v1,k2:v2"; malformed entries are logged and skipped"""
+    for tok in s.split(","):
+        k, sep, v = tok.partition(":")
+        k = k.strip()
+        if not sep or not k:
+            if tok.strip():
+                logger.warning("ignoring malformed env entry %r (expected key:value)", tok)
+            continue
+        try:
+            yield k, val(v.strip())
+        except ValueError as e:
+            logger.warning("ignoring env entry %r: %s", tok, e)
+
+
+# --- Simple persistent keystore (SQLite) ---
 data_dir = base_dir / "data"
 data_dir.mkdir(exist_ok=True)
+balances_db = data_dir / "balances.db"
+# JSON snapshot used before SQLite; imported once into an empty database
 balances_file = data_dir / "balances.json"
 
 
 class KeyStore:
-    def __init__(self, path: Path):
-        self.path = path
-        if not self.path.exists():
-            self._write({})
+    """API key balances and processed webhook event IDs in SQLite (WAL mode).
+
+    Every balance operation is a single SQL statement, so SQLite serializes
+    concurrent requests and worker processes without a Python-side lock:
+    ``charge`` is one conditional UPDATE, never a read followed by a write.
+    ``claim_event`` records a webhook event and grants its credits in one
+    transaction, so an event is never marked processed without its credits. Each thread
+    opens its own connection; writes run in a worker thread so the event
+    loop is not blocked while SQLite waits for another writer.
+
+    Only the last ``max_events`` processed event IDs are kept.
+    """
 
-    def _read(self) -> dict:
+    def __init__(self, path: Path, legacy_json: Path | None = None, max_events: int = 50_000):
+        self.path = path
+        self.max_events = max_events
+        self._local = threading.local()
+        db = self._db()
+        db.execute("CREATE TABLE IF NOT EXISTS balances (key TEXT PRIMARY KEY, bal INTEGER NOT NULL)")
+        db.execute("CREATE TABLE IF NOT EXISTS processed_events (id TEXT PRIMARY KEY)")
+        if legacy_json is not None and legacy_json.exists():
+            self._import_json(legacy_json)
+
+    def _db(self) -> sqlite3.Connection:
+        db = getattr(self._local, "db", None)
+        if db is None:
+            # Autocommit: each statement is its own transaction
+            db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db = db
+        return db
+
+    def _import_json(self, snapshot: Path) -> None:
+        db = self._db()
+        if db.execute("SELECT 1 FROM balances LIMIT 1").fetchone():
+            return
         try:
-            return json.loads(self.path.read_text(encoding="utf-8"))
+            data = {k: int(v) for k, v in orjson.loads(snapshot.read_bytes()).items()}
         except Exception:
-            return {}
-
-    def _write(self, data: dict) -> None:
-        tmp = self.path.with_suffix(".tmp")
-        tmp.write_text(json.dumps(data, indent=2), encoding="utf-8")
-        tmp.replace(self.path)
+            return
+        # Replay the append-only log that accompanied the snapshot, if any
+        log = snapshot.with_suffix(".log")
+        if log.exists():
+            for line in log.read_bytes().splitlines():
+                try:
+                    entry = orjson.loads(line)
+                    data[entry["k"]] = int(entry["v"])
+                except Exception:
+                    continue  # torn last line from a crash mid-append
+        db.executemany("INSERT OR IGNORE INTO balances (key, bal) VALUES (?, ?)", data.items())
+
+    def _returning(self, sql: str, params: tuple) -> int | None:
+        # fetchall() finishes the statement, which commits it in autocommit mode
+        rows = self._db().execute(sql, params).fetchall()
+        return rows[0][0] if rows else None
 
     def get_balance(self, key: str) -> int:
-        return int(self._read().get(key, 0))
-
-    def set_balance(self, key: str, value: int) -> None:
-        data = self._read()
-        data[key] = int(value)
-        self._write(data)
+        row = self._db().execute("SELECT bal FROM balances WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else 0
+
+    def _set(self, key: str, value: int) -> None:
+        self._db().execute(
+            "INSERT INTO balances (key, bal) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET bal = excluded.bal",
+            (key, value),
+        )
 
-    def add_credits(self, key: str, delta: int) -> int:
-        bal = self.get_balance(key) + int(delta)
-        self.set_balance(key, bal)
-        return bal
+    def _add(self, key: str, delta: int) -> int:
+        return self._returning(
+            "INSERT INTO balances (key, bal) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET bal = bal + excluded.bal RETURNING bal",
+            (key, delta),
+        )
 
-    def charge(self, key: str, delta: int = 1) -> int:
-        bal = self.get_balance(key)
-        if bal <= 0:
+    def _charge(self, key: str, delta: int) -> int:
+        bal = self._returning(
+            "UPDATE balances SET bal = bal - ? WHERE key = ? AND bal > 0 RETURNING bal",
+            (delta, key),
+        )
+        if bal is None:
             raise HTTPException(status_code=402, detail="Out of credits")
-        bal -= int(delta)
-        self.set_balance(key, bal)
         return bal
 
+    def _claim_event(self, event_id: str, key: str | None, delta: int) -> bool:
+        db = self._db()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            cur = db.execute("INSERT OR IGNORE INTO processed_events (id) VALUES (?)", (event_id,))
+            if cur.rowcount == 0:
+                db.execute("ROLLBACK")
+                return False
+            if cur.lastrowid % 1000 == 0:
+                db.execute("DELETE FROM processed_events WHERE rowid <= ?", (cur.lastrowid - self.max_events,))
+            if key and delta > 0:
+                db.execute(
+                    "INSERT INTO balances (key, bal) VALUES (?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET bal = bal + excluded.bal",
+                    (key, delta),
+                )
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        db.execute("COMMIT")
+        return True
+
+    def seen_event(self, event_id: str) -> bool:
+        return self._db().execute(
+            "SELECT 1 FROM processed_events WHERE id = ?", (event_id,)
+        ).fetchone() is not None
+
+    def seed(self, key: str, credits: int) -> None:
+        """Give ``key`` a starting balance unless it already has one.
+
+        Insert-if-absent rather than an add: every worker process seeds at
+        import, and restarts must not grant the credits again.
+        """
+        self._db().execute(
+            "INSERT OR IGNORE INTO balances (key, bal) VALUES (?, ?)", (key, int(credits))
+        )
+
+    async def set_balance(self, key: str, value: int) -> None:
+        await asyncio.to_thread(self._set, key, int(value))
+
+    async def add_credits(self, key: str, delta: int) -> int:
+        return await asyncio.to_thread(self._add, key, int(delta))
+
+    async def charge(self, key: str, delta: int = 1) -> int:
+        return await asyncio.to_thread(self._charge, key, int(delta))
+
+    async def claim_event(self, event_id: str, key: str | None = None, delta: int = 0) -> bool:
+        """Record a webhook event ID and credit ``key`` atomically; False if already processed"""
+        return await asyncio.to_thread(self._claim_event, event_id, key, int(delta))
 
-KEYS = KeyStore(balances_file)
+
+KEYS = KeyStore(balances_db, legacy_json=balances_file)
 
 # Seed from env if provided (e.g., "key1:25000,key2:5000")
 seed = os.getenv("INGRESSKIT_API_KEYS")
 if seed:
-    for pair in seed.split(','):
-        if ':' in pair:
-            k, v = pair.split(':', 1)
-            k = k.strip()
-            try:
-                KEYS.add_credits(k, int(v))
-            except Exception:
-                pass
+    for k, credits in _parse_kv_csv(seed):
+        KEYS.seed(k, credits)
 
 FREE_CREDITS_PER_DAY = int(os.getenv("INGRESSKIT_FREE_PER_DAY") or 100)
 
 
 def require_api_key(authorization: str | None = Header(default=None)) -> str:
-    if not authorization or not authorization.lower().startswith("bearer "):
+    # Only the 7-char scheme prefix is case-folded; the key is a plain slice
+    if not authorization or authorization[:7].lower() != "bearer ":
+        raise HTTPException(status_code=401, detail="Missing API key")
+    key = authorization[7:].strip()
+    if not key:
         raise HTTPException(status_code=401, detail="Missing API key")
-    key = authorization.split(" ", 1)[1]
     return key
 
 
-def charge_credit(key: str) -> None:
+async def charge_credit(key: str) -> None:
     # Known key: charge persistent balance. Unknown key: allow (free tier placeholder)
     if KEYS.get_balance(key) > 0:
-        KEYS.charge(key, 1)
+        await KEYS.charge(key, 1)
     else:
         return
 
 
 # --- Stripe Checkout + Webhook (auto-credit) ---
 stripe.api_key = os.getenv("STRIPE_SECRET_KEY", "")
+# One keep-alive session shared by every Stripe call so TCP+TLS handshakes are reused
+stripe.default_http_client = stripe.RequestsClient(timeout=10, session=requests.Session())
+stripe.max_network_retries = 2
 ADMIN_TOKEN = os.getenv("INGRESSKIT_ADMIN_TOKEN", "")
-PRICE_MAP = {}
 price_map_env = os.getenv("INGRESSKIT_PRICE_MAP")  # e.g., price_123:5000,price_456:20000
-if price_map_env:
-    for pair in price_map_env.split(','):
-        if ':' in pair:
-            p, c = pair.split(':', 1)
-            try:
-                PRICE_MAP[p.strip()] = int(c)
-            except Exception:
-                pass
+# Parsed once at startup; read-only views so request handlers cannot mutate them
+PRICE_MAP = MappingProxyType(dict(_parse_kv_csv(price_map_env or "")))
 
 # Optional alias mapping for frontend plan names → Stripe price IDs
-ALIASES: dict[str, str] = {}
 aliases_env = os.getenv("INGRESSKIT_PRICE_ALIASES")  # e.g., price_small:price_live_123,price_med:price_live_456
-if aliases_env:
-    for pair in aliases_env.split(','):
-        if ':' in pair:
-            a, pid = pair.split(':', 1)
-            ALIASES[a.strip()] = pid.strip()
+ALIASES = MappingProxyType(dict(_parse_kv_csv(aliases_env or "", str)))
 
 
 class CheckoutRequest(BaseModel):
@@ -163,8 +319,36 @@ class CheckoutRequest(BaseModel):
     cancel_url: str | None = None
 
 
-@app.post("/v1/billing/create_checkout")
-async def create_checkout(req: CheckoutRequest):
+_Model = TypeVar("_Model", bound=BaseModel)
+
+
+def _body_schema(model: type[BaseModel]) -> Dict[str, Any]:
+    """OpenAPI requestBody for routes that read their model via _read_model"""
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": model.model_json_schema()}},
+        }
+    }
+
+
+async def _read_model(request: Request, model: type[_Model]) -> _Model:
+    """Validate the raw body in one pass with pydantic-core's JSON parser.
+
+    Skips FastAPI's json.loads + dict validation; failures are still a 422 with
+    the same error shape.
+    """
+    try:
+        return model.model_validate_json(await request.body())
+    except ValidationError as e:
+        raise RequestValidationError(
+            [{**err, "loc": ("body", *err["loc"])} for err in e.errors(include_url=False)]
+        )
+
+
+@app.post("/v1/billing/create_checkout", openapi_extra=_body_schema(CheckoutRequest))
+async def create_checkout(request: Request):
+    req = await _read_model(request, CheckoutRequest)
     if not stripe.api_key:
         raise HTTPException(status_code=500, detail="Stripe not configured")
     success = req.success_url or os.getenv("CHECKOUT_SUCCESS_URL") or "https://ingresskit.com/"
@@ -175,45 +359,84 @@ async def create_checkout(req: CheckoutRequest):
         if price_id in ALIASES:
             price_id = ALIASES[price_id]
         checkout_mode = req.mode or "payment"
+        metadata = {"api_key": req.api_key}
+        # Carry the credits to grant so the webhook can skip list_line_items
+        if price_id in PRICE_MAP:
+            metadata["credits"] = str(PRICE_MAP[price_id])
         session = stripe.checkout.Session.create(
             mode=checkout_mode,
             line_items=[{"price": price_id, "quantity": 1}],
             success_url=success + "?session_id={CHECKOUT_SESSION_ID}",
             cancel_url=cancel,
-            metadata={"api_key": req.api_key},
+            metadata=metadata,
         )
-        return {"url": session.get("url")}
+        return {"url": session.url}
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"stripe_error:{type(e).__name__}:{str(e)}")
 
 
+@functools.lru_cache(maxsize=1024)
+def _line_item_prices(session_id: str) -> tuple[str, ...]:
+    """Price IDs of a checkout session's line items (one Stripe API call per session)"""
+    line_items = stripe.checkout.Session.list_line_items(session_id, limit=10).data
+    return tuple(li.price.id if li.price else "" for li in line_items)
+
+
 @app.post("/v1/billing/webhook")
 async def stripe_webhook(request: Request):
     payload = await request.body()
     sig = request.headers.get("stripe-signature", "")
     secret = os.getenv("STRIPE_WEBHOOK_SECRET", "")
     try:
-        event = stripe.Webhook.construct_event(payload, sig, secret) if secret else json.loads(payload)
+        if secret:
+            # Verified Event is parsed once by construct_event; read it via attributes
+            event = stripe.Webhook.construct_event(payload, sig, secret)
+            event_id, event_type = event.id, event.type
+        else:
+            event = orjson.loads(payload)
+            event_id, event_type = event.get("id"), event.get("type")
     except Exception:
         raise HTTPException(status_code=400, detail="invalid_signature")
 
-    if event.get("type") == "checkout.session.completed":
-        session = event.get("data", {}).get("object", {})
-        api_key = (session.get("metadata") or {}).get("api_key")
+    # Stripe retries and dashboard resends reuse the event ID; skip the line-item lookup
+    if event_id and KEYS.seen_event(str(event_id)):
+        return {"received": True, "dedup": True}
+
+    api_key, credits_total = None, 0
+    if event_type == "checkout.session.completed":
+        if secret:
+            session = event.data.object
+            # StripeObject raises AttributeError for absent fields; it has no .get
+            session_id, metadata = session.id, getattr(session, "metadata", None) or {}
+        else:
+            session = event.get("data", {}).get("object", {})
+            session_id, metadata = session.get("id"), session.get("metadata") or {}
+        api_key = metadata["api_key"] if "api_key" in metadata else None
         if api_key:
-            # Determine credits from line items via price map
-            credits_total = 0
-            line_items = []
-            try:
-                line_items = stripe.checkout.Session.list_line_items(session.get("id"), limit=10).get("data", [])
-            except Exception:
-                pass
-            for li in line_items:
-                price_id = ((li.get("price") or {}).get("id")) or ""
-                credits_total += PRICE_MAP.get(price_id, 0)
-            if credits_total > 0:
-                KEYS.add_credits(api_key, credits_total)
-    return {"received": True}
+            # Metadata written by create_checkout is only trusted on signed events
+            if secret and "credits" in metadata:
+                try:
+                    credits_total = int(metadata["credits"])
+                except ValueError:
+                    pass
+            else:
+                # Determine credits from line items via price map. A failed lookup is a
+                # 5xx, not a zero-credit ack, so Stripe delivers the event again.
+                try:
+                    prices = _line_item_prices(session_id)
+                except Exception:
+                    raise HTTPException(status_code=502, detail="line_items_unavailable")
+                for price_id in prices:
+                    credits_total += PRICE_MAP.get(price_id, 0)
+
+    # The event is marked processed only together with its credit grant; if that
+    # fails, nothing is recorded and Stripe's retry is handled from scratch
+    if event_id:
+        if not await KEYS.claim_event(str(event_id), api_key, credits_total):
+            return {"received": True, "dedup": True}
+    elif api_key and credits_total > 0:
+        await KEYS.add_credits(api_key, credits_total)
+    return Response(_RECEIVED, media_type="application/json")
 
 
 @app.get("/v1/billing/balance")
@@ -227,18 +450,22 @@ class AdminCreditRequest(BaseModel):
     amount: int
 
 
-@app.post("/v1/admin/credit")
-async def admin_credit(req: AdminCreditRequest, x_admin_token: str | None = Header(default=None)):
+@app.post("/v1/admin/credit", openapi_extra=_body_schema(AdminCreditRequest))
+async def admin_credit(request: Request, x_admin_token: str | None = Header(default=None)):
     if not ADMIN_TOKEN or x_admin_token != ADMIN_TOKEN:
         raise HTTPException(status_code=401, detail="unauthorized")
-    new_bal = KEYS.add_credits(req.api_key, req.amount)
+    req = await _read_model(request, AdminCreditRequest)
+    new_bal = await KEYS.add_credits(req.api_key, req.amount)
     return {"api_key": req.api_key, "balance": new_bal}
 
 
 @app.get("/v1/billing/resolve")
-async def resolve_price(name: str):
-    resolved = ALIASES.get(name, name)
-    return {"input": name, "resolved": resolved, "aliases": ALIASES}
+async def resolve_price(name: str, x_admin_token: str | None = Header(default=None)):
+    out: dict[str, Any] = {"input": name, "resolved": ALIASES.get(name, name)}
+    # The full alias table is only echoed to admins
+    if ADMIN_TOKEN and x_admin_token == ADMIN_TOKEN:
+        out["aliases"] = dict(ALIASES)
+    return out
 
 
 class CanonicalEvent(BaseModel):
@@ -256,85 +483,164 @@ def _utc_ts(ts: int | float | None) -> str:
     if ts is None:
         return datetime.now(timezone.utc).isoformat()
     try:
-        return datetime.fromtimestamp(float(ts), tz=timezone.utc).isoformat()
+        secs = float(ts)
+        # Whole-second epochs (Stripe, Slack): gmtime + strftime skip building a datetime.
+        # Bounded to years 1970-9999, where %Y is exactly four digits.
+        if secs.is_integer() and 0 <= secs < 253402300800:
+            return time.strftime("%Y-%m-%dT%H:%M:%S+00:00", time.gmtime(secs))
+        return datetime.fromtimestamp(secs, tz=timezone.utc).isoformat()
     except Exception:
         return datetime.now(timezone.utc).isoformat()
 
 
-def normalize_stripe(payload: Dict[str, Any]) -> CanonicalEvent:
+async def _read_json(request: Request) -> Any:
+    """Decode the request body with orjson; malformed JSON is a 400"""
+    try:
+        return orjson.loads(await request.body())
+    except orjson.JSONDecodeError:
+        raise HTTPException(status_code=400, detail="Invalid JSON")
+
+
+# Source fields lifted into actor/subject/action, so left out of metadata
+_STRIPE_SKIP = frozenset({"id", "object", "customer"})
+_SLACK_SKIP = frozenset({"user", "channel", "type"})
+
+# Static trace entries, shared by every event (serialized, never mutated)
+_STRIPE_TRACE = ({"op": "map", "field": "amount", "from": "amount", "to": "amount"},)
+_GITHUB_TRACE = ({"op": "map", "field": "title", "from": "issue.title", "to": "metadata.title"},)
+_SLACK_TRACE = ({"op": "map", "field": "text", "from": "event.text", "to": "metadata.text"},)
+
+
+def _without(d: Dict[str, Any], skip: frozenset[str]) -> Dict[str, Any]:
+    # Copy-then-pop beats a filtering comprehension when most keys are kept
+    out = dict(d)
+    for k in skip:
+        out.pop(k, None)
+    return out
+
+
+def normalize_stripe(payload: Dict[str, Any]) -> Dict[str, Any]:
     obj = payload.get("data", {}).get("object", {})
-    trace = []
-    ev = CanonicalEvent(
-        event_id=str(payload.get("id")),
-        source="stripe",
-        occurred_at=_utc_ts(payload.get("created")),
-        actor={"id": obj.get("customer")},
-        subject={"type": obj.get("object", "unknown"), "id": obj.get("id")},
-        action=str(payload.get("type", "unknown")),
-        metadata={k: v for k, v in obj.items() if k not in {"id", "object", "customer"}},
-        trace=trace,
-    )
-    trace.append({"op": "map", "field": "amount", "from": "amount", "to": "amount"})
-    return ev
-
-
-def normalize_github(payload: Dict[str, Any]) -> CanonicalEvent:
+    return {
+        "event_id": str(payload.get("id")),
+        "source": "stripe",
+        "occurred_at": _utc_ts(payload.get("created")),
+        "actor": {"id": obj.get("customer")},
+        "subject": {"type": obj.get("object", "unknown"), "id": obj.get("id")},
+        "action": str(payload.get("type", "unknown")),
+        "metadata": _without(obj, _STRIPE_SKIP),
+        "trace": _STRIPE_TRACE,
+    }
+
+
+def normalize_github(payload: Dict[str, Any]) -> Dict[str, Any]:
     action = payload.get("action", "unknown")
     issue = payload.get("issue") or {}
     sender = payload.get("sender") or {}
-    ev = CanonicalEvent(
-        event_id=str(payload.get("id", "")),
-        source="github",
-        occurred_at=datetime.now(timezone.utc).isoformat(),
-        actor={"id": sender.get("id"), "login": sender.get("login")},
-        subject={"type": "issue", "id": issue.get("id"), "number": issue.get("number")},
-        action=action,
-        metadata={"title": issue.get("title"), "url": issue.get("html_url")},
-        trace=[{"op": "map", "field": "title", "from": "issue.title", "to": "metadata.title"}],
-    )
-    return ev
-
-
-def normalize_slack(payload: Dict[str, Any]) -> CanonicalEvent:
+    return {
+        "event_id": str(payload.get("id", "")),
+        "source": "github",
+        "occurred_at": datetime.now(timezone.utc).isoformat(),
+        "actor": {"id": sender.get("id"), "login": sender.get("login")},
+        "subject": {"type": "issue", "id": issue.get("id"), "number": issue.get("number")},
+        "action": str(action),
+        "metadata": {"title": issue.get("title"), "url": issue.get("html_url")},
+        "trace": _GITHUB_TRACE,
+    }
+
+
+def normalize_slack(payload: Dict[str, Any]) -> Dict[str, Any]:
     ev = payload.get("event", {})
-    return CanonicalEvent(
-        event_id=str(payload.get("event_id", "")),
-        source="slack",
-        occurred_at=_utc_ts(payload.get("event_time")),
-        actor={"id": ev.get("user")},
-        subject={"type": ev.get("type", "message"), "channel": ev.get("channel")},
-        action=ev.get("type", "message"),
-        metadata={k: v for k, v in ev.items() if k not in {"user", "channel", "type"}},
-        trace=[{"op": "map", "field": "text", "from": "event.text", "to": "metadata.text"}],
-    )
-
-
-@app.post("/v1/webhooks/ingest")
+    return {
+        "event_id": str(payload.get("event_id", "")),
+        "source": "slack",
+        "occurred_at": _utc_ts(payload.get("event_time")),
+        "actor": {"id": ev.get("user")},
+        "subject": {"type": ev.get("type", "message"), "channel": ev.get("channel")},
+        "action": str(ev.get("type", "message")),
+        "metadata": _without(ev, _SLACK_SKIP),
+        "trace": _SLACK_TRACE,
+    }
+
+
+# Normalizers build plain dicts shaped like CanonicalEvent; the model only
+# documents the response schema, so each event is serialized exactly once
+NORMALIZERS: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+    "stripe": normalize_stripe,
+    "github": normalize_github,
+    "slack": normalize_slack,
+}
+
+
+class _ResponseCache:
+    """LRU of serialized responses, bounded by entry count and total bytes.
+
+    Values larger than ``max_item_bytes`` are not cached: one huge event
+    would otherwise evict many small ones.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int, max_item_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_item_bytes = max_item_bytes
+        self._items: OrderedDict[Any, bytes] = OrderedDict()
+        self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, key: Any) -> bytes | None:
+        value = self._items.get(key)
+        if value is not None:
+            self._items.move_to_end(key)
+        return value
+
+    def put(self, key: Any, value: bytes) -> None:
+        if len(value) > self.max_item_bytes or key in self._items:
+            return
+        self._items[key] = value
+        self._bytes += len(value)
+        while len(self._items) > self.max_entries or self._bytes > self.max_bytes:
+            self._bytes -= len(self._items.popitem(last=False)[1])
+
+    def clear(self) -> None:
+        self._items.clear()
+        self._bytes = 0
+
+
+# Retried deliveries resend identical bodies: (source, blake2b of the raw body)
+# -> serialized event, so a retry skips parsing and normalizing entirely.
+# Events embed the source payload, so the cache is capped in bytes as well.
+INGEST_CACHE_SIZE = 4096
+INGEST_CACHE_BYTES = 16 << 20
+INGEST_CACHE_MAX_ITEM_BYTES = 64 << 10
+_ingest_cache = _ResponseCache(INGEST_CACHE_SIZE, INGEST_CACHE_BYTES, INGEST_CACHE_MAX_ITEM_BYTES)
+
+
+@app.post("/v1/webhooks/ingest", response_model=CanonicalEvent)
 async def ingest(request: Request, source: str, api_key: str = Depends(require_api_key)):
-    try:
-        payload = await request.json()
-    except Exception:
-        raise HTTPException(status_code=400, detail="Invalid JSON")
+    body = await request.body()
+    cache_key = (source, hashlib.blake2b(body, digest_size=16).digest())
+    content = _ingest_cache.get(cache_key)
+    if content is None:
+        try:
+            payload = orjson.loads(body)
+        except orjson.JSONDecodeError:
+            raise HTTPException(status_code=400, detail="Invalid JSON")
 
-    if source == "stripe":
-        ev = normalize_stripe(payload)
-    elif source == "github":
-        ev = normalize_github(payload)
-    elif source == "slack":
-        ev = normalize_slack(payload)
-    else:
-        raise HTTPException(status_code=400, detail="Unsupported source")
+        normalizer = NORMALIZERS.get(source)
+        if normalizer is None:
+            raise HTTPException(status_code=400, detail="Unsupported source")
+        content = orjson.dumps(normalizer(payload))
+        _ingest_cache.put(cache_key, content)
 
-    charge_credit(api_key)
-    return ev.model_dump()
+    await charge_credit(api_key)
+    return Response(content=content, media_type="application/json")
 
 
 @app.post("/v1/json/normalize")
 async def json_normalize(request: Request, schema: str, api_key: str = Depends(require_api_key)):
-    try:
-        data = await request.json()
-    except Exception:
-        raise HTTPException(status_code=400, detail="Invalid JSON")
+    data = await _read_json(request)
 
     # Minimal repair example for contacts schema
     if schema == "contacts":
@@ -358,18 +664,29 @@ async def json_normalize(request: Request, schema: str, api_key: str = Depends(r
                 {"op": "split_name", "field": "name"},
             ],
         }
-        charge_credit(api_key)
+        await charge_credit(api_key)
         return out
 
     raise HTTPException(status_code=400, detail="Unsupported schema")
 
 
+_NON_DIGIT = re.compile(r"\D")
+# Every byte except ASCII 0-9: bytes.translate(None, _NON_DIGIT_BYTES) keeps digits
+_NON_DIGIT_BYTES = bytes(b for b in range(256) if not 0x30 <= b <= 0x39)
+
+
 def re_digits(v: str) -> str | None:
     if not v:
         return None
-    import re
-
-    d = re.sub(r"\D", "", v)
+    if v.isascii():
+        d = v.encode("ascii").translate(None, _NON_DIGIT_BYTES).decode("ascii")
+    else:
+        # Non-ASCII input may contain Unicode digits, which \D treats as digits
+        d = _NON_DIGIT.sub("", v)
     return d or None
 
 
+if __name__ == "__main__":
+    import uvicorn
+    # uvloop event loop + httptools parser, both installed by uvicorn[standard]
+    uvicorn.run(app, host="0.0.0.0", port=8080, loop="uvloop", http="httptools")
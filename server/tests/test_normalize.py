@@ -0,0 +1,54 @@
+import json
+from pathlib import Path
+from fastapi.testclient import TestClient
+
+from main import app
+
+
+FIXTURES = Path(__file__).resolve().parent.parent / "fixtures"
+
+
+def load_fixture(name: str) -> dict:
+    with (FIXTURES / name).open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+client = TestClient(app)
+
+
+def test_webhook_normalize_stripe():
+    payload = load_fixture("stripe_charge_succeeded.json")
+    resp = client.post("/v1/webhooks/normalize?source=stripe", json=payload)
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["source"] == "stripe"
+    assert data["action"] == "charge.succeeded"
+    assert data["actor"]["id"] == "cus_1"
+
+
+def test_webhook_normalize_invalid_json():
+    resp = client.post(
+        "/v1/webhooks/normalize?source=stripe",
+        content=b"{not json",
+        headers={"Content-Type": "application/json"},
+    )
+    assert resp.status_code == 400
+    assert resp.json() == {"detail": "Invalid JSON payload"}
+
+
+def test_webhook_normalize_unsupported_source():
+    resp = client.post("/v1/webhooks/normalize?source=paypal", json={"id": "evt_1"})
+    assert resp.status_code == 400
+    assert "Unsupported webhook source: paypal" in resp.json()["detail"]
+
+
+def test_json_normalize_contacts():
+    payload = {"Email": "USER@EXAMPLE.COM", "Name": "Doe, Jane", "Phone": "(555) 123-4567"}
+    resp = client.post("/v1/json/normalize?schema=contacts", json=payload)
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/json"
+    data = resp.json()
+    assert data["email"] == "user@example.com"
+    assert data["phone"] == "5551234567"
+    assert data["first_name"] == "Jane"
+    assert data["last_name"] == "Doe"
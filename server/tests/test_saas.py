@@ -0,0 +1,252 @@
+import asyncio
+import hashlib
+import hmac
+import json
+import time
+from pathlib import Path
+from types import MappingProxyType
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+pytest.importorskip("stripe")
+pytest.importorskip("dotenv")
+
+import main_saas_backup as saas  # noqa: E402
+from main_saas_backup import KeyStore  # noqa: E402
+
+
+FIXTURES = Path(__file__).resolve().parent.parent / "fixtures"
+
+
+def load_fixture(name: str) -> dict:
+    with (FIXTURES / name).open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return KeyStore(tmp_path / "balances.db")
+
+
+@pytest.fixture
+def client(store, monkeypatch):
+    monkeypatch.setattr(saas, "KEYS", store)
+    monkeypatch.setattr(saas, "ADMIN_TOKEN", "adm")
+    monkeypatch.setattr(saas, "ALIASES", MappingProxyType({"small": "price_a"}))
+    monkeypatch.setattr(saas, "PRICE_MAP", MappingProxyType({"price_a": 100}))
+    monkeypatch.delenv("STRIPE_WEBHOOK_SECRET", raising=False)
+    saas._ingest_cache.clear()
+    yield TestClient(saas.app)
+    saas._ingest_cache.clear()
+
+
+def test_legacy_json_and_log_imported_once(tmp_path):
+    snapshot = tmp_path / "balances.json"
+    snapshot.write_text(json.dumps({"a": 5, "b": 2}))
+    # Later log entries win; a torn last line from a crash is skipped
+    (tmp_path / "balances.log").write_text('{"k": "a", "v": 9}\n{"k": "c", "v": 4}\n{"k": "b"')
+    db = tmp_path / "balances.db"
+
+    store = KeyStore(db, legacy_json=snapshot)
+    assert [store.get_balance(k) for k in "abc"] == [9, 2, 4]
+
+    asyncio.run(store.charge("a", 1))
+    snapshot.write_text(json.dumps({"a": 100}))
+    reopened = KeyStore(db, legacy_json=snapshot)
+    assert reopened.get_balance("a") == 8
+
+
+def test_seed_only_sets_missing_keys(store):
+    store.seed("k", 10)
+    asyncio.run(store.charge("k"))
+    # Another worker (or a restart) seeding the same env must not add credits
+    store.seed("k", 10)
+    assert store.get_balance("k") == 9
+
+
+def test_charge_until_out_of_credits(store):
+    store.seed("k", 2)
+    assert asyncio.run(store.charge("k")) == 1
+    assert asyncio.run(store.charge("k")) == 0
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(store.charge("k"))
+    assert exc.value.status_code == 402
+    assert store.get_balance("k") == 0
+
+
+def test_concurrent_charges_never_overdraw(store):
+    store.seed("k", 50)
+
+    async def burst():
+        return await asyncio.gather(*(store.charge("k") for _ in range(80)), return_exceptions=True)
+
+    results = asyncio.run(burst())
+    charged = [r for r in results if isinstance(r, int)]
+    refused = [r for r in results if isinstance(r, HTTPException)]
+    assert len(charged) == 50
+    assert len(refused) == 30
+    assert all(r.status_code == 402 for r in refused)
+    assert sorted(charged) == list(range(50))
+    assert store.get_balance("k") == 0
+
+
+def test_claim_event_dedupes_and_grants_once(store):
+    assert asyncio.run(store.claim_event("evt_1", "k", 25)) is True
+    assert asyncio.run(store.claim_event("evt_1", "k", 25)) is False
+    assert store.seen_event("evt_1")
+    assert store.get_balance("k") == 25
+
+
+def test_claim_event_prunes_old_ids(tmp_path):
+    store = KeyStore(tmp_path / "balances.db", max_events=10)
+    for i in range(1, 1001):
+        assert asyncio.run(store.claim_event(f"evt_{i}"))
+    assert not store.seen_event("evt_1")
+    assert not store.seen_event("evt_990")
+    assert store.seen_event("evt_991")
+    assert store.seen_event("evt_1000")
+
+
+def test_ingest_replay_is_served_from_cache_and_charged(client, store):
+    store.seed("k1", 3)
+    headers = {"Authorization": "Bearer k1"}
+    payload = load_fixture("stripe_charge_succeeded.json")
+
+    first = client.post("/v1/webhooks/ingest?source=stripe", json=payload, headers=headers)
+    second = client.post("/v1/webhooks/ingest?source=stripe", json=payload, headers=headers)
+
+    assert first.status_code == second.status_code == 200
+    assert first.content == second.content
+    assert first.json()["action"] == "charge.succeeded"
+    assert len(saas._ingest_cache) == 1
+    assert store.get_balance("k1") == 1
+
+
+def test_ingest_cache_skips_large_events(client, store, monkeypatch):
+    monkeypatch.setattr(saas._ingest_cache, "max_item_bytes", 512)
+    payload = load_fixture("stripe_charge_succeeded.json")
+    payload["data"]["object"]["description"] = "x" * 1024
+    resp = client.post("/v1/webhooks/ingest?source=stripe", json=payload, headers={"Authorization": "Bearer k1"})
+    assert resp.status_code == 200
+    assert not saas._ingest_cache
+
+
+def test_response_cache_evicts_by_total_bytes():
+    cache = saas._ResponseCache(max_entries=10, max_bytes=10, max_item_bytes=8)
+    cache.put("a", b"aaaa")
+    cache.put("b", b"bbbb")
+    assert cache.get("a") == b"aaaa"
+    cache.put("c", b"cccc")
+    # "b" was least recently used once "a" was read
+    assert cache.get("b") is None
+    assert cache.get("a") == b"aaaa"
+    assert cache.get("c") == b"cccc"
+    cache.put("d", b"d" * 9)
+    assert cache.get("d") is None
+
+
+def test_ingest_unsupported_source_not_cached_or_charged(client, store):
+    store.seed("k1", 3)
+    resp = client.post(
+        "/v1/webhooks/ingest?source=paypal", json={"id": "evt_1"}, headers={"Authorization": "Bearer k1"}
+    )
+    assert resp.status_code == 400
+    assert not saas._ingest_cache
+    assert store.get_balance("k1") == 3
+
+
+def test_resolve_aliases_only_for_admin(client):
+    assert client.get("/v1/billing/resolve?name=small").json() == {"input": "small", "resolved": "price_a"}
+    wrong = client.get("/v1/billing/resolve?name=small", headers={"X-Admin-Token": "nope"})
+    assert "aliases" not in wrong.json()
+    admin = client.get("/v1/billing/resolve?name=small", headers={"X-Admin-Token": "adm"})
+    assert admin.json() == {"input": "small", "resolved": "price_a", "aliases": {"small": "price_a"}}
+
+
+def test_admin_credit(client, store):
+    resp = client.post("/v1/admin/credit", json={"api_key": "q", "amount": 7}, headers={"X-Admin-Token": "adm"})
+    assert resp.status_code == 200
+    assert resp.json() == {"api_key": "q", "balance": 7}
+    assert store.get_balance("q") == 7
+
+
+def test_admin_credit_validation_error_shape(client):
+    resp = client.post("/v1/admin/credit", json={"api_key": "q"}, headers={"X-Admin-Token": "adm"})
+    assert resp.status_code == 422
+    (err,) = resp.json()["detail"]
+    assert err["type"] == "missing"
+    assert err["loc"] == ["body", "amount"]
+
+
+def test_admin_credit_checks_token_before_body(client):
+    resp = client.post("/v1/admin/credit", json={"api_key": "q"})
+    assert resp.status_code == 401
+
+
+def test_create_checkout_validation_error_shape(client):
+    resp = client.post("/v1/billing/create_checkout", json={"price_id": "price_a"})
+    assert resp.status_code == 422
+    assert [e["loc"] for e in resp.json()["detail"]] == [["body", "api_key"]]
+
+
+def checkout_completed(event_id: str, session_id: str) -> dict:
+    return {
+        "id": event_id,
+        "type": "checkout.session.completed",
+        "data": {"object": {"id": session_id, "metadata": {"api_key": "buyer"}}},
+    }
+
+
+def test_webhook_line_item_failure_is_retryable(client, store, monkeypatch):
+    def unavailable(session_id):
+        raise RuntimeError("stripe down")
+
+    monkeypatch.setattr(saas, "_line_item_prices", unavailable)
+    event = checkout_completed("evt_9", "cs_9")
+    resp = client.post("/v1/billing/webhook", json=event)
+    assert resp.status_code == 502
+    assert not store.seen_event("evt_9")
+
+    monkeypatch.setattr(saas, "_line_item_prices", lambda session_id: ("price_a",))
+    assert client.post("/v1/billing/webhook", json=event).json() == {"received": True}
+    assert client.post("/v1/billing/webhook", json=event).json() == {"received": True, "dedup": True}
+    assert store.get_balance("buyer") == 100
+
+
+def signed_headers(body: bytes, secret: str) -> dict:
+    ts = str(int(time.time()))
+    sig = hmac.new(secret.encode(), ts.encode() + b"." + body, hashlib.sha256).hexdigest()
+    return {"stripe-signature": f"t={ts},v1={sig}", "content-type": "application/json"}
+
+
+def test_signed_webhook_trusts_checkout_metadata(client, store, monkeypatch):
+    monkeypatch.setenv("STRIPE_WEBHOOK_SECRET", "whsec_test")
+    event = checkout_completed("evt_s1", "cs_s1")
+    event["data"]["object"]["metadata"]["credits"] = "250"
+    body = json.dumps(event).encode()
+
+    resp = client.post("/v1/billing/webhook", content=body, headers=signed_headers(body, "whsec_test"))
+    assert resp.json() == {"received": True}
+    assert store.get_balance("buyer") == 250
+
+
+def test_signed_webhook_without_metadata(client, store, monkeypatch):
+    monkeypatch.setenv("STRIPE_WEBHOOK_SECRET", "whsec_test")
+    event = checkout_completed("evt_s2", "cs_s2")
+    del event["data"]["object"]["metadata"]
+    body = json.dumps(event).encode()
+
+    resp = client.post("/v1/billing/webhook", content=body, headers=signed_headers(body, "whsec_test"))
+    assert resp.status_code == 200
+    assert store.seen_event("evt_s2")
+
+
+def test_signed_webhook_rejects_bad_signature(client, store, monkeypatch):
+    monkeypatch.setenv("STRIPE_WEBHOOK_SECRET", "whsec_test")
+    body = json.dumps(checkout_completed("evt_s3", "cs_s3")).encode()
+
+    resp = client.post("/v1/billing/webhook", content=body, headers=signed_headers(body, "wrong"))
+    assert resp.status_code == 400
+    assert not store.seen_event("evt_s3")